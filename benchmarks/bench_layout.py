@@ -0,0 +1,172 @@
+# benchmarks/bench_layout.py
+"""Measure scroll region work with the layout scheduler versus the old handlers.
+
+Runs the same workload on a real Tk display twice: once with the dashboard as
+it is, and once with the pre-scheduler handlers reinstalled (two bbox scans per
+root <Configure> event, one per content frame <Configure>, and a forced
+update_idletasks() plus bbox scan after every gallery rebuild). Every call to
+Canvas.bbox is counted, so both numbers are measured rather than estimated.
+
+Usage:
+    python benchmarks/bench_layout.py            # starts Xvfb itself when there is no display
+    python benchmarks/bench_layout.py --images 60 --resizes 120
+
+Exits with status 1 if the scheduler does not reduce the number of bbox scans.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+
+def count_bbox_calls(canvases):
+    """Wrap Canvas.bbox on each canvas and return the shared call counter"""
+    counter = {'bbox_calls': 0}
+
+    for canvas in canvases:
+        def counting_bbox(*args, _bbox=canvas.bbox):
+            counter['bbox_calls'] += 1
+            return _bbox(*args)
+        canvas.bbox = counting_bbox
+
+    return counter
+
+
+def install_legacy_handlers(app):
+    """Replace the layout scheduler with the handlers the dashboard used before it"""
+    scheduler = app.layout_scheduler
+    scheduler.cancel()
+
+    for canvas, content_frame in list(scheduler.canvases.items()):
+        scheduler.unregister(canvas)
+        content_frame.bind("<Configure>", lambda e, c=canvas: c.configure(scrollregion=c.bbox("all")))
+
+    def on_window_resize(event):
+        app.root.after_idle(lambda: app.left_canvas.configure(scrollregion=app.left_canvas.bbox("all")))
+        app.root.after_idle(lambda: app.right_canvas.configure(scrollregion=app.right_canvas.bbox("all")))
+    app.root.bind('<Configure>', on_window_resize)
+
+    update_gallery_display = app.update_gallery_display
+
+    def legacy_update_gallery_display():
+        update_gallery_display()
+        app.gallery_canvas.update_idletasks()
+        app.gallery_canvas.configure(scrollregion=app.gallery_canvas.bbox("all"))
+    app.update_gallery_display = legacy_update_gallery_display
+
+
+def run_workload(app, images, resizes):
+    """Populate and resize the dashboard the way a user would"""
+    root = app.root
+
+    # Rebuild the gallery a few times with a growing number of images
+    for count in (len(images) // 3, 2 * len(images) // 3, len(images)):
+        app.image_gallery = list(images[:count])
+        app.update_gallery_display()
+        root.update()
+
+    # Grow and shrink the left panel
+    for i in range(20):
+        app.add_subreddit_entry(f"sub{i}")
+        root.update()
+    app.clear_subreddits()
+    root.update()
+
+    # Drag the window edge
+    for step in range(resizes):
+        root.geometry(f"{1200 + (step % 10) * 20}x{800 + (step % 6) * 15}")
+        root.update()
+
+    # Let any pending coalesced flush run
+    time.sleep(app.layout_scheduler.FRAME_MS / 1000 * 2)
+    root.update()
+
+
+def measure(legacy, images, resizes):
+    """Run the workload on a fresh dashboard and return the layout counters"""
+    import tkinter as tk
+    from main import RedditBotDashboard
+
+    root = tk.Tk()
+    app = RedditBotDashboard(root)
+    root.update()
+
+    if legacy:
+        install_legacy_handlers(app)
+
+    root_events = [0]
+    root.bind('<Configure>', lambda e: root_events.__setitem__(0, root_events[0] + 1), add="+")
+    counter = count_bbox_calls([app.left_canvas, app.right_canvas, app.gallery_canvas])
+
+    start = time.perf_counter()
+    run_workload(app, images, resizes)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'bbox_calls': counter['bbox_calls'],
+        'root_configure_events': root_events[0],
+        'seconds': round(elapsed, 6),
+    }
+    if not legacy:
+        result['scheduler'] = dict(app.layout_scheduler.stats)
+
+    app.on_close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scroll region work with and without the layout scheduler")
+    parser.add_argument('--images', type=int, default=30, help="images in the synthetic gallery")
+    parser.add_argument('--resizes', type=int, default=60, help="window resize steps")
+    parser.add_argument('--seed', type=int, default=1234, help="seed for the synthetic corpus")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    from bench_pipeline import generate_corpus, start_virtual_display
+
+    xvfb, display = start_virtual_display()
+    if display is None and sys.platform not in ('win32', 'darwin'):
+        print("No display available and Xvfb is not installed; cannot measure layout work")
+        return 1
+    if display:
+        os.environ['DISPLAY'] = display
+
+    corpus = tempfile.mkdtemp(prefix='redpost-corpus-')
+    workdir = tempfile.mkdtemp(prefix='redpost-bench-')
+    os.chdir(workdir)  # The dashboard writes logs/ relative to the working directory
+    try:
+        generate_corpus(corpus, args.images, args.seed)
+        images = sorted(os.path.join(corpus, name) for name in os.listdir(corpus)
+                        if not name.endswith('.txt'))
+
+        report = {
+            'legacy': measure(True, images, args.resizes),
+            'scheduler': measure(False, images, args.resizes),
+        }
+    finally:
+        if xvfb:
+            xvfb.terminate()
+        os.chdir(REPO_DIR)
+        shutil.rmtree(corpus, ignore_errors=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    legacy_calls = report['legacy']['bbox_calls']
+    scheduler_calls = report['scheduler']['bbox_calls']
+    report['reduction'] = round(1 - scheduler_calls / legacy_calls, 3) if legacy_calls else None
+    print(json.dumps(report, indent=2))
+
+    if scheduler_calls >= legacy_calls:
+        print("Layout scheduler did not reduce bbox scans")
+        return 1
+    print(f"bbox scans: {legacy_calls} -> {scheduler_calls}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+# benchmarks/bench_pipeline.py
+"""Offline benchmarks for the image and gallery pipeline.
+
+Generates a synthetic image corpus and measures folder scanning, thumbnail
+rendering and gallery rendering (under a virtual X display when needed),
+recording peak RSS for each phase. Every phase runs in its own subprocess so
+its peak RSS is not polluted by the others.
+
+Usage:
+    python benchmarks/bench_pipeline.py                  # run and compare to baseline
+    python benchmarks/bench_pipeline.py --save-baseline  # run and store as the new baseline
+    python benchmarks/bench_pipeline.py --images 300 --repeat 5 --threshold 0.15
+
+Exits with status 1 when a phase fails (including any image that fails to
+render), when a phase the baseline measured is skipped (unless --allow-skip),
+when the run settings (--images, --seed, --repeat) differ from the baseline's,
+or when a metric regresses past the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+PHASES = ('scan', 'thumbnail', 'gallery')
+
+# Image sizes, modes and the formats that can store each mode
+SIZES = [(64, 64), (320, 240), (800, 600), (1920, 1080), (4000, 3000)]
+FORMAT_MODES = {
+    'png': ('RGB', 'RGBA', 'L', 'LA', 'P'),
+    'jpg': ('RGB', 'L'),
+    'gif': ('P', 'L'),
+    'bmp': ('RGB', 'L', 'P'),
+    'webp': ('RGB', 'RGBA'),
+}
+
+# Run settings that must match the baseline for the comparison to mean anything
+MATCHED_META = ('images', 'seed', 'repeat')
+
+# Metrics that are compared against the baseline (lower is better), with the
+# smallest absolute change worth flagging so timer noise on tiny runs is ignored.
+# Timings compare the fastest run, which is far steadier than the median.
+COMPARED_METRICS = {
+    'min_s': 0.002,
+    'resize_min_s': 0.002,
+    'peak_rss_mb': 5,
+}
+
+
+def generate_corpus(folder, count, seed):
+    """Write a deterministic mix of image formats, sizes and alpha modes to folder"""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    formats = sorted(FORMAT_MODES)
+
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        mode = rng.choice(FORMAT_MODES[fmt])
+        # Large images are rarer, like in a real photo folder
+        size = rng.choices(SIZES, weights=[4, 4, 3, 2, 1])[0]
+
+        # Noise plus a gradient compresses like a real photo, not a flat fill
+        noise = Image.effect_noise(size, rng.randint(20, 80))
+        gradient = Image.linear_gradient('L').resize(size)
+        img = Image.merge('RGB', (noise, gradient, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+        if mode in ('RGBA', 'LA'):
+            img = img.convert(mode[:-1])
+            img.putalpha(gradient.transpose(Image.Transpose.ROTATE_180))
+        elif mode == 'P':
+            img = img.quantize(colors=rng.choice([16, 64, 256]))
+        else:
+            img = img.convert(mode)
+
+        # Mix upper and lower case extensions to exercise the scanner's filter
+        ext = fmt.upper() if i % 7 == 0 else fmt
+        img.save(os.path.join(folder, f"img_{i:04d}_{mode}_{size[0]}x{size[1]}.{ext}"))
+
+    # Files the scanner must skip
+    for i in range(max(1, count // 10)):
+        with open(os.path.join(folder, f"notes_{i}.txt"), 'w') as f:
+            f.write("not an image\n")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    # On Linux ru_maxrss survives fork and exec, so a phase would report its parent's
+    # peak; VmHWM belongs to the current address space only
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def timed(func, repeat):
+    """Run func repeat times and summarize the wall-clock timings"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_s': round(statistics.median(timings), 6),
+        'min_s': round(min(timings), 6),
+        'runs': repeat,
+    }
+
+
+def bench_scan(corpus, repeat):
+    """Measure scanning a folder for images"""
+    from main import RedditBotDashboard
+
+    images = RedditBotDashboard.scan_image_folder(corpus)
+    result = timed(lambda: RedditBotDashboard.scan_image_folder(corpus), repeat)
+    result['images'] = len(images)
+    return result
+
+
+def bench_thumbnail(corpus, repeat):
+    """Measure rendering gallery thumbnails for every image"""
+    from main import RedditBotDashboard
+
+    images = RedditBotDashboard.scan_image_folder(corpus)
+    failures = []
+
+    def render_all():
+        failures.clear()
+        for path in images:
+            try:
+                RedditBotDashboard.render_thumbnail(path, (80, 80))
+            except Exception:
+                failures.append(os.path.basename(path))
+
+    result = timed(render_all, repeat)
+    result['images'] = len(images)
+    result['per_image_ms'] = round(result['median_s'] / max(1, len(images)) * 1000, 3)
+    result['failures'] = len(failures)
+    result['failed_images'] = failures[:10]
+    return result
+
+
+def bench_gallery(corpus, repeat):
+    """Measure rebuilding the gallery and resizing the dashboard on a real Tk display"""
+    import tkinter as tk
+    from main import RedditBotDashboard
+    from bench_layout import count_bbox_calls
+
+    root = tk.Tk()
+    app = RedditBotDashboard(root)
+    root.update()
+
+    images = RedditBotDashboard.scan_image_folder(corpus)
+    app.image_gallery = list(images)
+
+    def render_gallery():
+        app.update_gallery_display()
+        root.update()  # Include geometry and scroll region work in the timing
+
+    result = timed(render_gallery, repeat)
+    result['images'] = len(images)
+
+    # Count layout work while resizing the populated dashboard
+    root_events = [0]
+    root.bind('<Configure>', lambda e: root_events.__setitem__(0, root_events[0] + 1), add="+")
+    counter = count_bbox_calls([app.left_canvas, app.right_canvas, app.gallery_canvas])
+    before = dict(app.layout_scheduler.stats)
+
+    def resize_window():
+        for step in range(60):
+            root.geometry(f"{1200 + (step % 10) * 20}x{800 + (step % 6) * 15}")
+            root.update()
+        time.sleep(app.layout_scheduler.FRAME_MS / 1000)
+        root.update()
+
+    resize = timed(resize_window, repeat)
+    result['resize_median_s'] = resize['median_s']
+    result['resize_min_s'] = resize['min_s']
+
+    stats = app.layout_scheduler.stats
+    result['layout'] = {key: stats[key] - before[key] for key in stats}
+    result['layout']['root_configure_events'] = root_events[0]
+    result['layout']['bbox_calls'] = counter['bbox_calls']
+
+    app.on_close()
+    return result
+
+
+def run_phase(phase, corpus, repeat):
+    """Run one phase in this process and print its result as JSON"""
+    sys.path.insert(0, REPO_DIR)
+
+    # The dashboard writes logs/ relative to the working directory
+    workdir = tempfile.mkdtemp(prefix='redpost-bench-')
+    os.chdir(workdir)
+    try:
+        result = {'scan': bench_scan, 'thumbnail': bench_thumbnail, 'gallery': bench_gallery}[phase](corpus, repeat)
+    finally:
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def start_virtual_display():
+    """Start Xvfb if there is no display; returns (process, display) or (None, None)"""
+    if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+        return None, os.environ.get('DISPLAY')
+    if not shutil.which('Xvfb'):
+        return None, None
+
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        display = f":{number}"
+        process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1600x1000x24', '-nolisten', 'tcp'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Wait for the server socket to appear
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                return process, display
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        process.kill()
+    return None, None
+
+
+def run_all(args):
+    """Generate the corpus, run every phase and collect the results"""
+    corpus = tempfile.mkdtemp(prefix='redpost-corpus-')
+    xvfb, display = start_virtual_display()
+
+    try:
+        # Generate in a subprocess so large images never inflate this process's peak RSS
+        print(f"Generating {args.images} images in {corpus}...")
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--generate-corpus', corpus,
+             '--images', str(args.images), '--seed', str(args.seed)],
+            check=True
+        )
+
+        results = {}
+        for phase in args.phases:
+            env = dict(os.environ)
+            if phase == 'gallery':
+                if display is None and sys.platform not in ('win32', 'darwin'):
+                    print("Skipping gallery: no display and Xvfb is not installed")
+                    results[phase] = {'skipped': 'no display available'}
+                    continue
+                if display:
+                    env['DISPLAY'] = display
+
+            print(f"Running {phase}...")
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--run-phase', phase,
+                 '--corpus', corpus, '--repeat', str(args.repeat)],
+                env=env, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                print(completed.stderr)
+                results[phase] = {'error': completed.stderr.strip().splitlines()[-1:]}
+                continue
+            results[phase] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+            # Images that fail to render make a phase look faster, so they fail it instead
+            if results[phase].get('failures'):
+                results[phase]['error'] = (f"{results[phase]['failures']} images failed: "
+                                           f"{', '.join(results[phase]['failed_images'])}")
+    finally:
+        if xvfb:
+            xvfb.terminate()
+        shutil.rmtree(corpus, ignore_errors=True)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pillow': pillow_version(),
+            'platform': platform.platform(),
+            'images': args.images,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+
+def pillow_version():
+    """Installed Pillow version"""
+    try:
+        import PIL
+        return PIL.__version__
+    except ImportError:
+        return None
+
+
+def mismatched_meta(report, baseline):
+    """Return the run settings that differ between this run and the baseline"""
+    return [
+        f"{key}={report['meta'].get(key)} (baseline {baseline.get('meta', {}).get(key)})"
+        for key in MATCHED_META
+        if report['meta'].get(key) != baseline.get('meta', {}).get(key)
+    ]
+
+
+def skipped_measured(report, baseline):
+    """Return phases skipped in this run that the baseline has measurements for"""
+    return [
+        phase for phase, result in report['results'].items()
+        if 'skipped' in result and 'min_s' in baseline.get('results', {}).get(phase, {})
+    ]
+
+
+def compare(report, baseline, threshold):
+    """Return a list of metrics that regressed more than threshold against the baseline"""
+    regressions = []
+    for phase, result in report['results'].items():
+        base = baseline.get('results', {}).get(phase, {})
+        for metric, noise_floor in COMPARED_METRICS.items():
+            current, previous = result.get(metric), base.get(metric)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            regressed = change > threshold and current - previous > noise_floor
+            status = "REGRESSION" if regressed else "ok"
+            print(f"  {phase:<10} {metric:<12} {previous:>12} -> {current:<12} {change:+.1%}  {status}")
+            if regressed:
+                regressions.append(f"{phase}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the image and gallery pipeline")
+    parser.add_argument('--images', type=int, default=120, help="number of images in the synthetic corpus")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per phase")
+    parser.add_argument('--seed', type=int, default=1234, help="seed for the synthetic corpus")
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=list(PHASES))
+    parser.add_argument('--threshold', type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--output', help="where to write the results JSON")
+    parser.add_argument('--allow-skip', action='store_true',
+                        help="don't fail when a phase measured in the baseline is skipped (e.g. no display)")
+    # Internal: run a single phase in a subprocess
+    parser.add_argument('--run-phase', choices=PHASES, help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    parser.add_argument('--generate-corpus', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_phase:
+        run_phase(args.run_phase, args.corpus, args.repeat)
+        return 0
+    if args.generate_corpus:
+        generate_corpus(args.generate_corpus, args.images, args.seed)
+        return 0
+
+    report = run_all(args)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}")
+
+    # A crashed phase is a failure, and must never become the baseline
+    errors = [phase for phase, result in report['results'].items() if 'error' in result]
+    if errors:
+        print(f"Failed phases: {', '.join(errors)}")
+        return 1
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    mismatched = mismatched_meta(report, baseline)
+    if mismatched:
+        print(f"Not comparing: run settings differ from the baseline: {', '.join(mismatched)}")
+        return 1
+
+    skipped = skipped_measured(report, baseline)
+    for phase in skipped:
+        print(f"Phase {phase} was skipped ({report['results'][phase]['skipped']}) but the baseline measured it")
+    if skipped and not args.allow_skip:
+        print("Failing; install Xvfb or pass --allow-skip to compare the remaining phases")
+        return 1
+
+    print(f"Comparing against baseline from {baseline.get('meta', {}).get('timestamp')}:")
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# layout_scheduler.py
+class ScrollRegionScheduler:
+    """Coalesces scroll region updates for scrollable canvases.
+
+    Each canvas is recomputed at most once per frame, and only when the size
+    of its content frame actually changed since the last update.
+    """
+
+    FRAME_MS = 16  # ~60 updates per second at most
+
+    def __init__(self, root):
+        self.root = root
+        self.canvases = {}  # canvas -> content frame
+        self.last_sizes = {}  # canvas -> content size at the last update
+        self.dirty = set()
+        self.pending = None
+
+        # Counters for measuring how much work is coalesced away
+        self.stats = {'requests': 0, 'flushes': 0, 'bbox_scans': 0, 'skipped': 0}
+
+        # Don't let a pending flush fire after the window is torn down
+        root.bind("<Destroy>", lambda e: self.cancel() if e.widget is root else None, add="+")
+
+    def register(self, canvas, content_frame):
+        """Track a canvas whose scroll region follows the size of content_frame"""
+        self.canvases[canvas] = content_frame
+        content_frame.bind("<Configure>", lambda e: self.request(canvas))
+        canvas.bind("<Destroy>", lambda e: self.unregister(canvas), add="+")
+        self.request(canvas)
+
+    def unregister(self, canvas):
+        """Stop tracking a canvas"""
+        self.canvases.pop(canvas, None)
+        self.last_sizes.pop(canvas, None)
+        self.dirty.discard(canvas)
+
+    def request(self, *canvases):
+        """Mark canvases (all registered ones if none given) for a scroll region update"""
+        for canvas in canvases or tuple(self.canvases):
+            if canvas in self.canvases:
+                self.stats['requests'] += 1
+                self.dirty.add(canvas)
+
+        if self.dirty and self.pending is None:
+            self.pending = self.root.after(self.FRAME_MS, self.flush)
+
+    def flush(self):
+        """Recompute the scroll region of every dirty canvas whose content changed"""
+        self.pending = None
+        self.stats['flushes'] += 1
+        dirty, self.dirty = self.dirty, set()
+
+        for canvas in dirty:
+            content_frame = self.canvases.get(canvas)
+            if content_frame is None or not canvas.winfo_exists():
+                continue
+
+            # Reading the frame size is cheap; only scan the canvas when it changed
+            size = (content_frame.winfo_width(), content_frame.winfo_height())
+            if size == self.last_sizes.get(canvas):
+                self.stats['skipped'] += 1
+                continue
+
+            self.stats['bbox_scans'] += 1
+            self.last_sizes[canvas] = size
+            canvas.configure(scrollregion=canvas.bbox("all"))
+
+    def cancel(self):
+        """Cancel any pending update"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
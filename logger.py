@@ -1,5 +1,8 @@
+import bisect
+import json
 import logging
 import os
+import time
 from datetime import datetime
 
 class BotLogger:
@@ -29,4 +32,189 @@ class BotLogger:
         elif level == 'error':
             self.logger.error(message)
         elif level == 'warning':
-            self.logger.warning(message)
\ No newline at end of file
+            self.logger.warning(message)
+
+class ActivityLogStore:
+    """Append-only on-disk activity log with in-memory indexes for fast filtering"""
+    
+    LEVELS = ('info', 'warning', 'error')
+    
+    def __init__(self, log_dir='logs', max_entries=20000):
+        os.makedirs(log_dir, exist_ok=True)
+        # One file for all sessions, so time filters can reach across days
+        self.path = os.path.join(log_dir, "activity.jsonl")
+        # Older entries are dropped at startup so the file and the index stay bounded
+        self.max_entries = max_entries
+        
+        self._file = open(self.path, 'a+b')
+        self._rebuild_index()
+        if self.count() > self.max_entries:
+            self._compact()
+    
+    def _reset_index(self):
+        """Clear all in-memory indexes"""
+        # Byte offset, timestamp and lowercased message of every entry, indexed by entry id
+        self.offsets = []
+        self.timestamps = []
+        self.messages = []
+        
+        # Entry ids grouped by level and subreddit (kept sorted because ids only grow)
+        self.by_level = {level: [] for level in self.LEVELS}
+        self.by_subreddit = {}
+    
+    def _rebuild_index(self):
+        """Scan the existing log file once and rebuild the indexes"""
+        self._reset_index()
+        self._file.seek(0)
+        offset = 0
+        for line in iter(self._file.readline, b''):
+            if not line.endswith(b'\n'):
+                # Drop a torn last line left by a crash so the next append starts a fresh line
+                self._file.truncate(offset)
+                break
+            try:
+                entry = json.loads(line)
+                self._validate(entry)
+                self._index_entry(offset, entry)
+            except ValueError:
+                pass  # Skip a corrupt line
+            offset += len(line)
+        self._end = offset
+    
+    def _compact(self):
+        """Rewrite the log keeping only the newest max_entries entries"""
+        self._file.seek(self.offsets[self.count() - self.max_entries])
+        kept = self._file.read()
+        self._file.close()
+        
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(kept)
+        os.replace(tmp_path, self.path)
+        
+        self._file = open(self.path, 'a+b')
+        self._rebuild_index()
+    
+    @staticmethod
+    def _validate(entry):
+        """Raise ValueError unless entry has the fields the indexes and the UI rely on"""
+        if not isinstance(entry, dict):
+            raise ValueError("Log entry is not an object")
+        ts = entry.get('ts')
+        if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+            raise ValueError("Log entry has no numeric timestamp")
+        if not isinstance(entry.get('level'), str) or not isinstance(entry.get('message'), str):
+            raise ValueError("Log entry has no level or message")
+        if entry.get('subreddit') is not None and not isinstance(entry['subreddit'], str):
+            raise ValueError("Log entry has an invalid subreddit")
+    
+    def _index_entry(self, offset, entry):
+        """Add a validated entry to the indexes"""
+        ts = entry['ts']
+        subreddit = entry.get('subreddit')
+        
+        # query() bisects on timestamps, so keep them sorted even if the clock went backwards
+        if self.timestamps:
+            ts = max(ts, self.timestamps[-1])
+        
+        entry_id = len(self.offsets)
+        self.offsets.append(offset)
+        self.timestamps.append(ts)
+        self.messages.append(entry['message'].lower())
+        self.by_level.setdefault(entry['level'], []).append(entry_id)
+        if subreddit:
+            self.by_subreddit.setdefault(subreddit.lower(), []).append(entry_id)
+        return entry_id
+    
+    def append(self, message, level='info', subreddit=None):
+        """Append an entry to the log and return it"""
+        entry = {
+            'ts': time.time(),
+            'level': str(level),
+            'subreddit': str(subreddit) if subreddit else None,
+            'message': str(message),
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        
+        # Everything that can fail happens before the write, so the index never drifts from the file
+        offset = self._end
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(line)
+        self._file.flush()
+        self._end += len(line)
+        
+        entry['id'] = self._index_entry(offset, entry)
+        return entry
+    
+    def read(self, entry_id):
+        """Read a single entry from disk"""
+        self._file.seek(self.offsets[entry_id])
+        entry = json.loads(self._file.readline())
+        entry['id'] = entry_id
+        return entry
+    
+    def count(self):
+        """Number of entries in the log"""
+        return len(self.offsets)
+    
+    def subreddits(self):
+        """Subreddits that appear in the log"""
+        return sorted(self.by_subreddit)
+    
+    def matches(self, entry, level=None, subreddit=None, text=None, since=None):
+        """Check whether an entry passes the given filters"""
+        if level and entry['level'] != level:
+            return False
+        if subreddit and (entry.get('subreddit') or '').lower() != subreddit.lower():
+            return False
+        if since is not None and entry['ts'] < since:
+            return False
+        if text and text.lower() not in entry['message'].lower():
+            return False
+        return True
+    
+    def query(self, level=None, subreddit=None, text=None, since=None, before=None, limit=200):
+        """Return up to `limit` matching entries older than entry id `before`, oldest first"""
+        if before is None:
+            before = self.count()
+        
+        # The time index gives the lowest candidate id directly
+        start = bisect.bisect_left(self.timestamps, since) if since is not None else 0
+        
+        # Narrow candidates with the level and subreddit indexes
+        candidates = None
+        if level:
+            candidates = self.by_level.get(level, [])
+        if subreddit:
+            sub_ids = self.by_subreddit.get(subreddit.lower(), [])
+            if candidates is None:
+                candidates = sub_ids
+            else:
+                sub_set = set(sub_ids)
+                candidates = [i for i in candidates if i in sub_set]
+        
+        if candidates is None:
+            ids = range(before - 1, start - 1, -1)
+        else:
+            lo = bisect.bisect_left(candidates, start)
+            hi = bisect.bisect_left(candidates, before)
+            ids = reversed(candidates[lo:hi])
+        
+        # Walk newest to oldest, matching text against the in-memory messages
+        # so only the returned page is read from disk
+        if text:
+            text = text.lower()
+            ids = (i for i in ids if text in self.messages[i])
+        
+        results = []
+        for entry_id in ids:
+            results.append(self.read(entry_id))
+            if len(results) >= limit:
+                break
+        
+        results.reverse()
+        return results
+    
+    def close(self):
+        """Close the underlying file"""
+        self._file.close()
@@ -7,10 +7,24 @@ import random
 import os
 from datetime import datetime
 from bot_core import RedditBot
-from logger import BotLogger
+from logger import BotLogger, ActivityLogStore
+from layout_scheduler import ScrollRegionScheduler
 from PIL import Image, ImageTk
 
 class RedditBotDashboard:
+    # Time filter choices for the activity log, in seconds (None means no limit)
+    LOG_TIME_WINDOWS = {
+        "All time": None,
+        "Last 15 minutes": 15 * 60,
+        "Last hour": 60 * 60,
+        "Last 24 hours": 24 * 60 * 60,
+    }
+    
+    # Delay between the last filter keystroke and the activity log refresh
+    LOG_REFRESH_DELAY_MS = 250
+    
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp')
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Reddit Multi-Post Bot Dashboard")
@@ -22,6 +36,12 @@ class RedditBotDashboard:
         
         self.bot = RedditBot()
         self.logger = BotLogger()
+        self.log_store = ActivityLogStore()
+        
+        # Activity log paging state
+        self.log_page_size = 200
+        self.log_oldest_id = None
+        self.log_refresh_job = None
         
         self.is_posting = False
         self.posting_thread = None
@@ -30,11 +50,17 @@ class RedditBotDashboard:
         self.title_entries = []
         self.image_thumbnails = []
         
+        # Single coalescing scheduler for all scroll region updates
+        self.layout_scheduler = ScrollRegionScheduler(self.root)
+        
         self.create_dashboard()
         self.update_status("Ready - Configure your settings and start posting")
         
         # Bind window resize event to update canvas scroll regions
         self.root.bind('<Configure>', self.on_window_resize)
+        
+        # Release resources when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def configure_styles(self):
         """Configure modern styling for the application"""
@@ -54,12 +80,20 @@ class RedditBotDashboard:
         # Configure the root background
         self.root.configure(bg='#ecf0f1')
     
+    def on_close(self):
+        """Stop posting, release the log and layout scheduler, and destroy the window"""
+        self.is_posting = False
+        if self.log_refresh_job is not None:
+            self.root.after_cancel(self.log_refresh_job)
+        self.layout_scheduler.cancel()
+        self.log_store.close()
+        self.root.destroy()
+    
     def on_window_resize(self, event):
         """Handle window resize events"""
-        if hasattr(self, 'left_canvas') and hasattr(self, 'right_canvas'):
-            # Update canvas scroll regions when window is resized
-            self.root.after_idle(lambda: self.left_canvas.configure(scrollregion=self.left_canvas.bbox("all")))
-            self.root.after_idle(lambda: self.right_canvas.configure(scrollregion=self.right_canvas.bbox("all")))
+        # The root binding also fires for every child widget; only react to the window itself
+        if event.widget is self.root:
+            self.layout_scheduler.request()
     
     def create_dashboard(self):
         """Create the main dashboard"""
@@ -76,11 +110,6 @@ class RedditBotDashboard:
         left_scrollbar = ttk.Scrollbar(left_scroll_frame, orient="vertical", command=left_canvas.yview)
         left_scrollable_frame = ttk.Frame(left_canvas)
         
-        left_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: left_canvas.configure(scrollregion=left_canvas.bbox("all"))
-        )
-        
         left_canvas.create_window((0, 0), window=left_scrollable_frame, anchor="nw")
         left_canvas.configure(yscrollcommand=left_scrollbar.set)
         
@@ -96,11 +125,6 @@ class RedditBotDashboard:
         right_scrollbar = ttk.Scrollbar(right_scroll_frame, orient="vertical", command=right_canvas.yview)
         right_scrollable_frame = ttk.Frame(right_canvas)
         
-        right_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: right_canvas.configure(scrollregion=right_canvas.bbox("all"))
-        )
-        
         right_canvas.create_window((0, 0), window=right_scrollable_frame, anchor="nw")
         right_canvas.configure(yscrollcommand=right_scrollbar.set)
         
@@ -111,6 +135,10 @@ class RedditBotDashboard:
         self.left_canvas = left_canvas
         self.right_canvas = right_canvas
         
+        # Keep scroll regions in sync with the panel contents
+        self.layout_scheduler.register(left_canvas, left_scrollable_frame)
+        self.layout_scheduler.register(right_canvas, right_scrollable_frame)
+        
         # Bind mouse wheel events
         self.bind_mousewheel(left_canvas)
         self.bind_mousewheel(right_canvas)
@@ -235,17 +263,14 @@ class RedditBotDashboard:
         gallery_scrollbar = ttk.Scrollbar(self.gallery_display_frame, orient="horizontal", command=self.gallery_canvas.xview)
         self.gallery_scrollable_frame = ttk.Frame(self.gallery_canvas)
         
-        self.gallery_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.gallery_canvas.configure(scrollregion=self.gallery_canvas.bbox("all"))
-        )
-        
         self.gallery_canvas.create_window((0, 0), window=self.gallery_scrollable_frame, anchor="nw")
         self.gallery_canvas.configure(xscrollcommand=gallery_scrollbar.set)
         
         self.gallery_canvas.pack(side="top", fill="both", expand=True)
         gallery_scrollbar.pack(side="bottom", fill="x")
         
+        self.layout_scheduler.register(self.gallery_canvas, self.gallery_scrollable_frame)
+        
         self.gallery_status_label = ttk.Label(gallery_frame, text="No images in gallery", 
                                             style='Heading.TLabel', foreground='gray')
         self.gallery_status_label.pack(pady=(10, 0))
@@ -346,21 +371,57 @@ class RedditBotDashboard:
         
         ttk.Button(log_controls, text="🗑 Clear Log", command=self.clear_log,
                   style='Danger.TButton').pack(side="right")
+        self.load_older_btn = ttk.Button(log_controls, text="⬆ Load Older", command=self.load_older_log,
+                                        style='Primary.TButton')
+        self.load_older_btn.pack(side="right", padx=(0, 10))
+        
+        # Search and filter controls
+        log_filters = ttk.Frame(log_frame)
+        log_filters.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(log_filters, text="🔍", font=('Arial', 10)).pack(side="left", padx=(0, 5))
+        self.log_search_var = tk.StringVar()
+        ttk.Entry(log_filters, textvariable=self.log_search_var, width=20,
+                 font=('Arial', 10)).pack(side="left", fill="x", expand=True, padx=(0, 10))
+        
+        self.log_level_var = tk.StringVar(value="All levels")
+        ttk.Combobox(log_filters, textvariable=self.log_level_var, state="readonly", width=10,
+                    values=["All levels"] + list(ActivityLogStore.LEVELS)).pack(side="left", padx=(0, 10))
+        
+        self.log_subreddit_var = tk.StringVar(value="All subreddits")
+        self.log_subreddit_combo = ttk.Combobox(log_filters, textvariable=self.log_subreddit_var,
+                                                width=16, postcommand=self.update_log_subreddit_choices)
+        self.log_subreddit_combo.pack(side="left", padx=(0, 10))
+        
+        self.log_time_var = tk.StringVar(value="All time")
+        ttk.Combobox(log_filters, textvariable=self.log_time_var, state="readonly", width=14,
+                    values=list(self.LOG_TIME_WINDOWS)).pack(side="left")
+        
+        # Refresh the view once typing in the filters pauses
+        for var in (self.log_search_var, self.log_level_var, self.log_subreddit_var, self.log_time_var):
+            var.trace('w', self.schedule_log_refresh)
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, font=("Consolas", 9),
                                                  bg='#f8f9fa', relief='flat', borderwidth=0)
         self.log_text.pack(fill="both", expand=True)
+        
+        # Show the most recent entries from earlier sessions
+        self.refresh_log_view()
+    
+    @staticmethod
+    def scan_image_folder(folder):
+        """Get paths of the images in a folder"""
+        images = []
+        for file in os.listdir(folder):
+            if file.lower().endswith(RedditBotDashboard.IMAGE_EXTENSIONS):
+                images.append(os.path.join(folder, file))
+        return images
     
     def select_image_folder(self):
         """Select folder containing images"""
         folder = filedialog.askdirectory(title="Select Image Folder")
         if folder:
-            image_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp')
-            images = []
-            
-            for file in os.listdir(folder):
-                if file.lower().endswith(image_extensions):
-                    images.append(os.path.join(folder, file))
+            images = self.scan_image_folder(folder)
             
             self.image_gallery.extend(images)
             self.update_gallery_display()
@@ -399,10 +460,10 @@ class RedditBotDashboard:
                 self.log("✅ Reddit API connection successful")
             else:
                 messagebox.showerror("Error", "Failed to authenticate with Reddit API")
-                self.log("❌ Reddit API authentication failed")
+                self.log("❌ Reddit API authentication failed", level='error')
         except Exception as e:
             messagebox.showerror("Error", f"Connection failed: {str(e)}")
-            self.log(f"❌ Connection error: {str(e)}")
+            self.log(f"❌ Connection error: {str(e)}", level='error')
     
     def preview_posts(self):
         """Preview what posts will be made with visual thumbnails"""
@@ -563,9 +624,11 @@ class RedditBotDashboard:
         if not self.validate_inputs():
             return
         
-        # Clear the activity log for a fresh start
+        # Clear the activity log view for a fresh start (history stays in the log store)
         if hasattr(self, 'log_text'):
             self.log_text.delete("1.0", tk.END)
+            self.log_oldest_id = self.log_store.count()
+            self.load_older_btn.config(state="normal")
         
         self.is_posting = True
         self.start_btn.config(state="disabled")
@@ -662,7 +725,7 @@ class RedditBotDashboard:
                 self.username_var.get(),
                 self.password_var.get()
             ):
-                self.log("❌ Authentication failed")
+                self.log("❌ Authentication failed", level='error')
                 return
             
             subreddits = self.get_subreddits()
@@ -696,16 +759,16 @@ class RedditBotDashboard:
                     
                     if post_url:
                         successful_posts += 1
-                        self.log(f"✅ Posted to r/{subreddit}: {title}")
-                        self.log(f"   URL: {post_url}")
-                        self.log(f"   Images: {[os.path.basename(img) for img in selected_images]}")
+                        self.log(f"✅ Posted to r/{subreddit}: {title}", subreddit=subreddit)
+                        self.log(f"   URL: {post_url}", subreddit=subreddit)
+                        self.log(f"   Images: {[os.path.basename(img) for img in selected_images]}", subreddit=subreddit)
                     else:
                         failed_posts += 1
-                        self.log(f"❌ Failed to post to r/{subreddit}")
+                        self.log(f"❌ Failed to post to r/{subreddit}", level='error', subreddit=subreddit)
                 
                 except Exception as e:
                     failed_posts += 1
-                    self.log(f"❌ Error posting to r/{subreddit}: {str(e)}")
+                    self.log(f"❌ Error posting to r/{subreddit}: {str(e)}", level='error', subreddit=subreddit)
                 
                 # Update progress
                 self.root.after(0, lambda: self.progress.config(value=i+1))
@@ -727,11 +790,11 @@ class RedditBotDashboard:
                 self.log("🎉 All posts completed!")
                 self.root.after(0, lambda: self.update_status("Completed successfully"))
             else:
-                self.log("⏹ Posting stopped by user")
+                self.log("⏹ Posting stopped by user", level='warning')
                 self.root.after(0, lambda: self.update_status("Stopped by user"))
         
         except Exception as e:
-            self.log(f"💥 Unexpected error: {str(e)}")
+            self.log(f"💥 Unexpected error: {str(e)}", level='error')
         
         finally:
             self.root.after(0, lambda: self.current_action_label.config(text=""))
@@ -770,13 +833,75 @@ class RedditBotDashboard:
         self.stats_text.insert("1.0", stats)
         self.stats_text.config(state="disabled")
     
-    def log(self, message):
+    def log(self, message, level='info', subreddit=None):
         """Add message to log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\\n"
+        # Store writes and widget updates both happen on the Tk thread
+        self.root.after(0, lambda: self.append_log_entry(message, level, subreddit))
+    
+    def append_log_entry(self, message, level, subreddit):
+        """Persist a log entry and show it if it matches the current filters"""
+        entry = self.log_store.append(message, level=level, subreddit=subreddit)
+        
+        if self.log_store.matches(entry, **self.get_log_filters()):
+            if self.log_oldest_id is None:
+                self.log_oldest_id = entry['id']
+            self.log_text.insert(tk.END, self.format_log_entry(entry))
+            self.log_text.see(tk.END)
+    
+    def format_log_entry(self, entry):
+        """Format a stored log entry for display"""
+        timestamp = datetime.fromtimestamp(entry['ts']).strftime("%H:%M:%S")
+        return f"[{timestamp}] {entry['message']}\n"
+    
+    def get_log_filters(self):
+        """Get the activity log filters from the search controls"""
+        level = self.log_level_var.get()
+        subreddit = self.log_subreddit_var.get().strip()
+        if subreddit.startswith('r/'):
+            subreddit = subreddit[2:]
+        window = self.LOG_TIME_WINDOWS.get(self.log_time_var.get())
+        
+        return {
+            'level': level if level in ActivityLogStore.LEVELS else None,
+            'subreddit': subreddit if subreddit and subreddit != "All subreddits" else None,
+            'text': self.log_search_var.get().strip() or None,
+            'since': time.time() - window if window else None,
+        }
+    
+    def schedule_log_refresh(self, *args):
+        """Refresh the activity log after the filters stop changing for a moment"""
+        if self.log_refresh_job is not None:
+            self.root.after_cancel(self.log_refresh_job)
+        self.log_refresh_job = self.root.after(self.LOG_REFRESH_DELAY_MS, self.refresh_log_view)
+    
+    def refresh_log_view(self, *args):
+        """Reload the activity log with the latest page of matching entries"""
+        self.log_refresh_job = None
+        entries = self.log_store.query(limit=self.log_page_size, **self.get_log_filters())
         
-        self.root.after(0, lambda: self.log_text.insert(tk.END, log_entry))
-        self.root.after(0, lambda: self.log_text.see(tk.END))
+        self.log_text.delete("1.0", tk.END)
+        self.log_text.insert(tk.END, "".join(self.format_log_entry(e) for e in entries))
+        self.log_text.see(tk.END)
+        
+        self.log_oldest_id = entries[0]['id'] if entries else None
+        self.load_older_btn.config(state="normal" if len(entries) == self.log_page_size else "disabled")
+    
+    def load_older_log(self):
+        """Page the previous batch of matching entries into the top of the log"""
+        before = self.log_oldest_id if self.log_oldest_id is not None else self.log_store.count()
+        entries = self.log_store.query(before=before, limit=self.log_page_size, **self.get_log_filters())
+        
+        if entries:
+            self.log_text.insert("1.0", "".join(self.format_log_entry(e) for e in entries))
+            self.log_text.see("1.0")
+            self.log_oldest_id = entries[0]['id']
+        
+        if len(entries) < self.log_page_size:
+            self.load_older_btn.config(state="disabled")
+    
+    def update_log_subreddit_choices(self):
+        """Fill the subreddit filter with subreddits seen in the log"""
+        self.log_subreddit_combo.config(values=["All subreddits"] + self.log_store.subreddits())
     
     def update_pause_range(self, *args):
         """Update the pause range display"""
@@ -897,29 +1022,34 @@ class RedditBotDashboard:
     def create_thumbnail(self, image_path, size=(100, 100)):
         """Create a thumbnail for an image"""
         try:
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary (for PNG with transparency)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                
-                # Calculate aspect ratio and resize
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                
-                # Create a white background and center the image
-                background = Image.new('RGB', size, (255, 255, 255))
-                x = (size[0] - img.size[0]) // 2
-                y = (size[1] - img.size[1]) // 2
-                background.paste(img, (x, y))
-                
-                return ImageTk.PhotoImage(background)
+            return ImageTk.PhotoImage(self.render_thumbnail(image_path, size))
         except Exception as e:
             print(f"Error creating thumbnail for {image_path}: {e}")
             return None
     
+    @staticmethod
+    def render_thumbnail(image_path, size=(100, 100)):
+        """Render a centered thumbnail on a white background as a PIL image"""
+        with Image.open(image_path) as img:
+            # Convert to RGB if necessary (for PNG with transparency)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+                img = background
+            
+            # Calculate aspect ratio and resize
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+            
+            # Create a white background and center the image
+            background = Image.new('RGB', size, (255, 255, 255))
+            x = (size[0] - img.size[0]) // 2
+            y = (size[1] - img.size[1]) // 2
+            background.paste(img, (x, y))
+            
+            return background
+    
     def update_gallery_display(self):
         """Update gallery display with thumbnails"""
         # Clear existing thumbnails
@@ -962,9 +1092,8 @@ class RedditBotDashboard:
                                       command=lambda path=image_path: self.remove_image(path))
                 remove_btn.pack(pady=(2, 2))
         
-        # Update canvas scroll region
-        self.gallery_canvas.update_idletasks()
-        self.gallery_canvas.configure(scrollregion=self.gallery_canvas.bbox("all"))
+        # Update canvas scroll region on the next frame
+        self.layout_scheduler.request(self.gallery_canvas)
     
     def remove_image(self, image_path):
         """Remove an image from the gallery"""
@@ -974,8 +1103,10 @@ class RedditBotDashboard:
             self.log(f"Removed image: {os.path.basename(image_path)}")
     
     def clear_log(self):
-        """Clear the activity log"""
+        """Clear the activity log view (history stays on disk and can be paged back in)"""
         self.log_text.delete("1.0", tk.END)
+        self.log_oldest_id = self.log_store.count()
+        self.load_older_btn.config(state="normal")
         self.log("🧹 Log cleared")
 
 